@@ -4,73 +4,177 @@ Formula representation and parsing for Natural Deduction Proof Assistant.
 This module implements the formula structure for propositional and first-order logic
 following van Dalen's formal system. It includes:
 - Abstract formula classes for both logics
-- A recursive descent parser
+- A tokenizer and recursive descent parser
 - String representation methods for pretty printing
+
+Formula and term nodes are hash-consed: constructing a node that is
+structurally equal to a live one returns the existing object, so equality
+is identity and hashing reads a stored integer. `f1 is f2` is therefore a
+sound equality test, and each node's `uid` is a unique integer that is
+never reused; IdSet and IdDict are keyed on it.
 """
 
-from abc import ABC, abstractmethod
-from typing import Set, List, Optional, Union
+from collections.abc import MutableMapping, MutableSet
+from typing import ClassVar, Dict, FrozenSet, Set, List, NoReturn, Optional, Sequence, Tuple, Union
+import itertools
 import re
+import sys
+import weakref
+
+
+# Interning table mapping (class, field/child-id...) keys to the unique live node.
+# Children are always interned before their parent, so child ids identify
+# child structure; a weak table lets unused formulas be garbage collected.
+_INTERN: 'weakref.WeakValueDictionary[tuple, Union[Formula, Term]]' = weakref.WeakValueDictionary()
+_NEXT_ID = itertools.count()
+
+# Shared free-variable set for closed nodes
+_EMPTY: FrozenSet[str] = frozenset()
+
+
+def _new_node(cls, key: tuple):
+    """Allocate a node of cls, assign its id, and register it under key.
+
+    The caller sets the node's fields and its structural _hash.
+    """
+    node = object.__new__(cls)
+    node._id = next(_NEXT_ID)
+    node._subst_cache = None
+    node._str = None
+    _INTERN[key] = node
+    return node
+
+
+def _memo_substitute(node, var: str, term):
+    """Substitute term for variable var (memoized per node).
+
+    Nodes where var is not free are returned unchanged. Other results are
+    kept in a per-node cache that is unbounded and holds every result alive
+    for as long as the source node lives; nodes that substitute into each
+    other (P(x) and P(y)) form cycles that only the cyclic GC frees, so
+    substituted formulas linger in the weak interner until it runs.
+
+    Bound directly as Formula.substitute and Term.substitute, so each level
+    of a recursive substitution costs two frames rather than three.
+    """
+    if var not in node._fv:
+        return node
+    key = (var, term)
+    cache = node._subst_cache
+    if cache is None:
+        cache = node._subst_cache = {}
+    else:
+        result = cache.get(key)
+        if result is not None:
+            return result
+    result = cache[key] = node._substitute(var, term)
+    return result
+
+
+class Formula:
+    """Base class for logical formulas."""
+
+    __slots__ = ('_id', '_hash', '_fv', '_subst_cache', '_str', '__weakref__')
+
+    # Set once by _new_node and the subclass __new__
+    _id: int
+    _hash: int
+    _fv: FrozenSet[str]
+    _subst_cache: Optional[Dict[tuple, Union['Formula', 'Term']]]
+    _str: Optional[str]
+
+    # Whether the formula needs parentheses when printed under a negation
+    _needs_neg_parens = False
 
-
-class Formula(ABC):
-    """Abstract base class for logical formulas."""
-
-    @abstractmethod
     def __str__(self) -> str:
-        """Return string representation of the formula."""
-        pass
+        """Return string representation of the formula (cached per node)."""
+        text = self._str
+        if text is None:
+            text = self._str = self._format()
+        return text
+
+    def _format(self) -> str:
+        """Build the string representation of the formula."""
+        raise NotImplementedError
 
-    @abstractmethod
     def __eq__(self, other) -> bool:
-        """Check equality of formulas."""
-        pass
+        """Check equality of formulas (interned, so identity)."""
+        return self is other
 
-    @abstractmethod
     def __hash__(self) -> int:
         """Return hash for use in sets/dicts."""
-        pass
+        return self._hash
+
+    @property
+    def uid(self) -> int:
+        """Unique id of this interned formula."""
+        return self._id
 
-    @abstractmethod
-    def get_free_variables(self) -> Set[str]:
-        """Return set of free variables in the formula."""
-        pass
+    def __reduce__(self):
+        """Rebuild through the constructor, so copies and unpickled formulas are interned."""
+        # Subclass __slots__ list the constructor arguments in order
+        return type(self), tuple(getattr(self, field) for field in type(self).__slots__)
 
-    @abstractmethod
-    def substitute(self, var: str, term: 'Term') -> 'Formula':
-        """Substitute term for variable in formula."""
-        pass
+    def get_free_variables(self) -> FrozenSet[str]:
+        """Return the (immutable, shared) set of free variables in the formula."""
+        raise NotImplementedError
+
+    substitute = _memo_substitute
+
+    def _substitute(self, var: str, term: 'Term') -> 'Formula':
+        """Substitute term for a variable known to occur free in the formula."""
+        raise NotImplementedError
 
-    @abstractmethod
     def is_free_for(self, term: 'Term', var: str) -> bool:
         """Check if term is free for substitution of var."""
-        pass
+        raise NotImplementedError
+
 
+class Term:
+    """Base class for terms in first-order logic."""
 
-class Term(ABC):
-    """Abstract base class for terms in first-order logic."""
+    __slots__ = ('_id', '_hash', '_fv', '_subst_cache', '_str', '__weakref__')
+
+    # Set once by _new_node and the subclass __new__
+    _id: int
+    _hash: int
+    _fv: FrozenSet[str]
+    _subst_cache: Optional[Dict[tuple, Union['Formula', 'Term']]]
+    _str: Optional[str]
 
-    @abstractmethod
     def __str__(self) -> str:
-        pass
+        text = self._str
+        if text is None:
+            text = self._str = self._format()
+        return text
+
+    def _format(self) -> str:
+        raise NotImplementedError
 
-    @abstractmethod
     def __eq__(self, other) -> bool:
-        pass
+        return self is other
 
-    @abstractmethod
     def __hash__(self) -> int:
-        pass
+        return self._hash
 
-    @abstractmethod
-    def get_variables(self) -> Set[str]:
-        """Return set of all variables in the term."""
-        pass
+    @property
+    def uid(self) -> int:
+        """Unique id of this interned term."""
+        return self._id
 
-    @abstractmethod
-    def substitute(self, var: str, term: 'Term') -> 'Term':
-        """Substitute term for variable."""
-        pass
+    def __reduce__(self):
+        """Rebuild through the constructor, so copies and unpickled terms are interned."""
+        return type(self), tuple(getattr(self, field) for field in type(self).__slots__)
+
+    def get_variables(self) -> FrozenSet[str]:
+        """Return the (immutable, shared) set of all variables in the term."""
+        raise NotImplementedError
+
+    substitute = _memo_substitute
+
+    def _substitute(self, var: str, term: 'Term') -> 'Term':
+        """Substitute term for a variable known to occur in the term."""
+        raise NotImplementedError
 
 
 # TERMS
@@ -78,22 +182,28 @@ class Term(ABC):
 class Variable(Term):
     """Variable term."""
 
-    def __init__(self, name: str):
-        self.name = name
+    __slots__ = ('name',)
+    name: str
+    _tag: ClassVar[int] = 1
+
+    def __new__(cls, name: str):
+        name = sys.intern(name)
+        key = (cls, name)
+        self = _INTERN.get(key)
+        if self is None:
+            self = _new_node(cls, key)
+            self.name = name
+            self._hash = hash(name) ^ cls._tag
+            self._fv = frozenset((name,))
+        return self
 
-    def __str__(self) -> str:
+    def _format(self) -> str:
         return self.name
 
-    def __eq__(self, other) -> bool:
-        return isinstance(other, Variable) and self.name == other.name
-
-    def __hash__(self) -> int:
-        return hash(('Variable', self.name))
+    def get_variables(self) -> FrozenSet[str]:
+        return self._fv
 
-    def get_variables(self) -> Set[str]:
-        return {self.name}
-
-    def substitute(self, var: str, term: Term) -> Term:
+    def _substitute(self, var: str, term: Term) -> Term:
         if self.name == var:
             return term
         return self
@@ -102,52 +212,61 @@ class Variable(Term):
 class Constant(Term):
     """Constant term."""
 
-    def __init__(self, name: str):
-        self.name = name
+    __slots__ = ('name',)
+    name: str
+    _tag: ClassVar[int] = 2
+
+    def __new__(cls, name: str):
+        name = sys.intern(name)
+        key = (cls, name)
+        self = _INTERN.get(key)
+        if self is None:
+            self = _new_node(cls, key)
+            self.name = name
+            self._hash = hash(name) ^ cls._tag
+            self._fv = _EMPTY
+        return self
 
-    def __str__(self) -> str:
+    def _format(self) -> str:
         return self.name
 
-    def __eq__(self, other) -> bool:
-        return isinstance(other, Constant) and self.name == other.name
-
-    def __hash__(self) -> int:
-        return hash(('Constant', self.name))
-
-    def get_variables(self) -> Set[str]:
-        return set()
+    def get_variables(self) -> FrozenSet[str]:
+        return self._fv
 
-    def substitute(self, var: str, term: Term) -> Term:
+    def _substitute(self, var: str, term: Term) -> Term:
         return self
 
 
 class FunctionApplication(Term):
     """Function application f(t1, ..., tn)."""
 
-    def __init__(self, function: str, args: List[Term]):
-        self.function = function
-        self.args = args
+    __slots__ = ('function', 'args')
+    function: str
+    args: Tuple[Term, ...]
+    _tag: ClassVar[int] = 3
+
+    def __new__(cls, function: str, args: Sequence[Term]):
+        function = sys.intern(function)
+        args = tuple(args)
+        key = (cls, function, tuple(id(arg) for arg in args))
+        self = _INTERN.get(key)
+        if self is None:
+            self = _new_node(cls, key)
+            self.function = function
+            self.args = args
+            self._hash = hash((cls._tag, function, tuple(arg._hash for arg in args)))
+            self._fv = _EMPTY.union(*(arg._fv for arg in args)) or _EMPTY
+        return self
 
-    def __str__(self) -> str:
+    def _format(self) -> str:
         args_str = ', '.join(str(arg) for arg in self.args)
         return f"{self.function}({args_str})"
 
-    def __eq__(self, other) -> bool:
-        return (isinstance(other, FunctionApplication) and
-                self.function == other.function and
-                self.args == other.args)
-
-    def __hash__(self) -> int:
-        return hash(('FunctionApplication', self.function, tuple(self.args)))
-
-    def get_variables(self) -> Set[str]:
-        variables = set()
-        for arg in self.args:
-            variables.update(arg.get_variables())
-        return variables
+    def get_variables(self) -> FrozenSet[str]:
+        return self._fv
 
-    def substitute(self, var: str, term: Term) -> Term:
-        new_args = [arg.substitute(var, term) for arg in self.args]
+    def _substitute(self, var: str, term: Term) -> Term:
+        new_args = tuple(arg.substitute(var, term) for arg in self.args)
         return FunctionApplication(self.function, new_args)
 
 
@@ -156,32 +275,35 @@ class FunctionApplication(Term):
 class AtomicFormula(Formula):
     """Atomic proposition or predicate."""
 
-    def __init__(self, predicate: str, args: List[Term] = None):
-        self.predicate = predicate
-        self.args = args if args is not None else []
+    __slots__ = ('predicate', 'args')
+    predicate: str
+    args: Tuple[Term, ...]
+    _tag: ClassVar[int] = 4
+
+    def __new__(cls, predicate: str, args: Optional[Sequence[Term]] = None):
+        predicate = sys.intern(predicate)
+        args = tuple(args) if args is not None else ()
+        key = (cls, predicate, tuple(id(arg) for arg in args))
+        self = _INTERN.get(key)
+        if self is None:
+            self = _new_node(cls, key)
+            self.predicate = predicate
+            self.args = args
+            self._hash = hash((cls._tag, predicate, tuple(arg._hash for arg in args)))
+            self._fv = _EMPTY.union(*(arg._fv for arg in args)) or _EMPTY
+        return self
 
-    def __str__(self) -> str:
+    def _format(self) -> str:
         if not self.args:
             return self.predicate
         args_str = ', '.join(str(arg) for arg in self.args)
         return f"{self.predicate}({args_str})"
 
-    def __eq__(self, other) -> bool:
-        return (isinstance(other, AtomicFormula) and
-                self.predicate == other.predicate and
-                self.args == other.args)
-
-    def __hash__(self) -> int:
-        return hash(('AtomicFormula', self.predicate, tuple(self.args)))
-
-    def get_free_variables(self) -> Set[str]:
-        variables = set()
-        for arg in self.args:
-            variables.update(arg.get_variables())
-        return variables
+    def get_free_variables(self) -> FrozenSet[str]:
+        return self._fv
 
-    def substitute(self, var: str, term: Term) -> Formula:
-        new_args = [arg.substitute(var, term) for arg in self.args]
+    def _substitute(self, var: str, term: Term) -> Formula:
+        new_args = tuple(arg.substitute(var, term) for arg in self.args)
         return AtomicFormula(self.predicate, new_args)
 
     def is_free_for(self, term: Term, var: str) -> bool:
@@ -192,19 +314,27 @@ class AtomicFormula(Formula):
 class Bottom(Formula):
     """The bottom (false) formula ⊥."""
 
-    def __str__(self) -> str:
-        return "⊥"
+    __slots__ = ()
+    _tag: ClassVar[int] = 5
 
-    def __eq__(self, other) -> bool:
-        return isinstance(other, Bottom)
+    # The single ⊥ node, held strongly so it never leaves the interner
+    _instance: ClassVar[Optional['Bottom']] = None
 
-    def __hash__(self) -> int:
-        return hash('Bottom')
+    def __new__(cls):
+        self = cls._instance
+        if self is None:
+            self = cls._instance = _new_node(cls, (cls,))
+            self._hash = hash(cls._tag)
+            self._fv = _EMPTY
+        return self
 
-    def get_free_variables(self) -> Set[str]:
-        return set()
+    def _format(self) -> str:
+        return "⊥"
 
-    def substitute(self, var: str, term: Term) -> Formula:
+    def get_free_variables(self) -> FrozenSet[str]:
+        return self._fv
+
+    def _substitute(self, var: str, term: Term) -> Formula:
         return self
 
     def is_free_for(self, term: Term, var: str) -> bool:
@@ -214,25 +344,30 @@ class Bottom(Formula):
 class Negation(Formula):
     """Negation ¬φ."""
 
-    def __init__(self, formula: Formula):
-        self.formula = formula
+    __slots__ = ('formula',)
+    formula: Formula
+    _tag: ClassVar[int] = 6
+
+    def __new__(cls, formula: Formula):
+        key = (cls, id(formula))
+        self = _INTERN.get(key)
+        if self is None:
+            self = _new_node(cls, key)
+            self.formula = formula
+            self._hash = hash((cls._tag, formula._hash))
+            self._fv = formula._fv
+        return self
 
-    def __str__(self) -> str:
+    def _format(self) -> str:
         # Add parentheses for binary connectives
-        if isinstance(self.formula, (Conjunction, Disjunction, Implication)):
+        if self.formula._needs_neg_parens:
             return f"¬({self.formula})"
         return f"¬{self.formula}"
 
-    def __eq__(self, other) -> bool:
-        return isinstance(other, Negation) and self.formula == other.formula
-
-    def __hash__(self) -> int:
-        return hash(('Negation', self.formula))
-
-    def get_free_variables(self) -> Set[str]:
-        return self.formula.get_free_variables()
+    def get_free_variables(self) -> FrozenSet[str]:
+        return self._fv
 
-    def substitute(self, var: str, term: Term) -> Formula:
+    def _substitute(self, var: str, term: Term) -> Formula:
         return Negation(self.formula.substitute(var, term))
 
     def is_free_for(self, term: Term, var: str) -> bool:
@@ -242,25 +377,30 @@ class Negation(Formula):
 class Conjunction(Formula):
     """Conjunction φ ∧ ψ."""
 
-    def __init__(self, left: Formula, right: Formula):
-        self.left = left
-        self.right = right
+    __slots__ = ('left', 'right')
+    left: Formula
+    right: Formula
+    _tag: ClassVar[int] = 7
+    _needs_neg_parens = True
+
+    def __new__(cls, left: Formula, right: Formula):
+        key = (cls, id(left), id(right))
+        self = _INTERN.get(key)
+        if self is None:
+            self = _new_node(cls, key)
+            self.left = left
+            self.right = right
+            self._hash = hash((cls._tag, left._hash, right._hash))
+            self._fv = (left._fv | right._fv) or _EMPTY
+        return self
 
-    def __str__(self) -> str:
+    def _format(self) -> str:
         return f"({self.left} ∧ {self.right})"
 
-    def __eq__(self, other) -> bool:
-        return (isinstance(other, Conjunction) and
-                self.left == other.left and
-                self.right == other.right)
-
-    def __hash__(self) -> int:
-        return hash(('Conjunction', self.left, self.right))
-
-    def get_free_variables(self) -> Set[str]:
-        return self.left.get_free_variables() | self.right.get_free_variables()
+    def get_free_variables(self) -> FrozenSet[str]:
+        return self._fv
 
-    def substitute(self, var: str, term: Term) -> Formula:
+    def _substitute(self, var: str, term: Term) -> Formula:
         return Conjunction(
             self.left.substitute(var, term),
             self.right.substitute(var, term)
@@ -274,25 +414,30 @@ class Conjunction(Formula):
 class Disjunction(Formula):
     """Disjunction φ ∨ ψ."""
 
-    def __init__(self, left: Formula, right: Formula):
-        self.left = left
-        self.right = right
+    __slots__ = ('left', 'right')
+    left: Formula
+    right: Formula
+    _tag: ClassVar[int] = 8
+    _needs_neg_parens = True
+
+    def __new__(cls, left: Formula, right: Formula):
+        key = (cls, id(left), id(right))
+        self = _INTERN.get(key)
+        if self is None:
+            self = _new_node(cls, key)
+            self.left = left
+            self.right = right
+            self._hash = hash((cls._tag, left._hash, right._hash))
+            self._fv = (left._fv | right._fv) or _EMPTY
+        return self
 
-    def __str__(self) -> str:
+    def _format(self) -> str:
         return f"({self.left} ∨ {self.right})"
 
-    def __eq__(self, other) -> bool:
-        return (isinstance(other, Disjunction) and
-                self.left == other.left and
-                self.right == other.right)
-
-    def __hash__(self) -> int:
-        return hash(('Disjunction', self.left, self.right))
-
-    def get_free_variables(self) -> Set[str]:
-        return self.left.get_free_variables() | self.right.get_free_variables()
+    def get_free_variables(self) -> FrozenSet[str]:
+        return self._fv
 
-    def substitute(self, var: str, term: Term) -> Formula:
+    def _substitute(self, var: str, term: Term) -> Formula:
         return Disjunction(
             self.left.substitute(var, term),
             self.right.substitute(var, term)
@@ -306,25 +451,30 @@ class Disjunction(Formula):
 class Implication(Formula):
     """Implication φ → ψ."""
 
-    def __init__(self, antecedent: Formula, consequent: Formula):
-        self.antecedent = antecedent
-        self.consequent = consequent
+    __slots__ = ('antecedent', 'consequent')
+    antecedent: Formula
+    consequent: Formula
+    _tag: ClassVar[int] = 9
+    _needs_neg_parens = True
+
+    def __new__(cls, antecedent: Formula, consequent: Formula):
+        key = (cls, id(antecedent), id(consequent))
+        self = _INTERN.get(key)
+        if self is None:
+            self = _new_node(cls, key)
+            self.antecedent = antecedent
+            self.consequent = consequent
+            self._hash = hash((cls._tag, antecedent._hash, consequent._hash))
+            self._fv = (antecedent._fv | consequent._fv) or _EMPTY
+        return self
 
-    def __str__(self) -> str:
+    def _format(self) -> str:
         return f"({self.antecedent} → {self.consequent})"
 
-    def __eq__(self, other) -> bool:
-        return (isinstance(other, Implication) and
-                self.antecedent == other.antecedent and
-                self.consequent == other.consequent)
-
-    def __hash__(self) -> int:
-        return hash(('Implication', self.antecedent, self.consequent))
-
-    def get_free_variables(self) -> Set[str]:
-        return self.antecedent.get_free_variables() | self.consequent.get_free_variables()
+    def get_free_variables(self) -> FrozenSet[str]:
+        return self._fv
 
-    def substitute(self, var: str, term: Term) -> Formula:
+    def _substitute(self, var: str, term: Term) -> Formula:
         return Implication(
             self.antecedent.substitute(var, term),
             self.consequent.substitute(var, term)
@@ -335,207 +485,308 @@ class Implication(Formula):
                 self.consequent.is_free_for(term, var))
 
 
+# Helpers shared by the quantifier classes
+
+def _quant_substitute(node, var: str, term: Term, cls) -> Formula:
+    """Capture-avoiding substitution into a quantified formula of type cls."""
+    if node.variable in term.get_variables():
+        # Need to rename bound variable to avoid capture
+        new_var = _fresh_variable(node.variable, term.get_variables() |
+                                  node.formula.get_free_variables())
+        renamed_formula = node.formula.substitute(node.variable, Variable(new_var))
+        return cls(new_var, renamed_formula.substitute(var, term))
+    else:
+        return cls(node.variable, node.formula.substitute(var, term))
+
+
+def _quant_is_free_for(node, term: Term, var: str) -> bool:
+    """Check if term is free for var in a quantified formula."""
+    if var == node.variable:
+        return True
+    if node.variable in term.get_variables():
+        # The term contains the bound variable, check if var occurs free
+        # in the scope where the variable is bound
+        return var not in node.formula.get_free_variables()
+    return node.formula.is_free_for(term, var)
+
+
+def _fresh_variable(base: str, used_vars: FrozenSet[str]) -> str:
+    """Generate a fresh variable name from base that is not in used_vars.
+
+    Suffixes are probed from 0 on every call, so the name depends only on the
+    arguments and memoized substitutions stay reproducible.
+    """
+    counter = 0
+    name = base + '0'
+    while name in used_vars:
+        counter += 1
+        name = base + str(counter)
+    return name
+
+
 class Universal(Formula):
     """Universal quantification ∀x.φ."""
 
-    def __init__(self, variable: str, formula: Formula):
-        self.variable = variable
-        self.formula = formula
+    __slots__ = ('variable', 'formula')
+    variable: str
+    formula: Formula
+    _tag: ClassVar[int] = 10
+
+    def __new__(cls, variable: str, formula: Formula):
+        variable = sys.intern(variable)
+        key = (cls, variable, id(formula))
+        self = _INTERN.get(key)
+        if self is None:
+            self = _new_node(cls, key)
+            self.variable = variable
+            self.formula = formula
+            self._hash = hash((cls._tag, variable, formula._hash))
+            self._fv = (formula._fv - {variable}) or _EMPTY
+        return self
 
-    def __str__(self) -> str:
+    def _format(self) -> str:
         return f"∀{self.variable}.{self.formula}"
 
-    def __eq__(self, other) -> bool:
-        return (isinstance(other, Universal) and
-                self.variable == other.variable and
-                self.formula == other.formula)
+    def get_free_variables(self) -> FrozenSet[str]:
+        return self._fv
 
-    def __hash__(self) -> int:
-        return hash(('Universal', self.variable, self.formula))
-
-    def get_free_variables(self) -> Set[str]:
-        free_vars = self.formula.get_free_variables()
-        return free_vars - {self.variable}
-
-    def substitute(self, var: str, term: Term) -> Formula:
-        if var == self.variable:
-            # Variable is bound, no substitution
-            return self
-        elif self.variable in term.get_variables():
-            # Need to rename bound variable to avoid capture
-            new_var = self._fresh_variable(term.get_variables() |
-                                           self.formula.get_free_variables())
-            renamed_formula = self.formula.substitute(self.variable, Variable(new_var))
-            return Universal(new_var, renamed_formula.substitute(var, term))
-        else:
-            return Universal(self.variable, self.formula.substitute(var, term))
+    def _substitute(self, var: str, term: Term) -> Formula:
+        return _quant_substitute(self, var, term, Universal)
 
     def is_free_for(self, term: Term, var: str) -> bool:
-        if var == self.variable:
-            return True
-        if self.variable in term.get_variables():
-            # The term contains the bound variable, check if var occurs free
-            # in the scope where the variable is bound
-            return var not in self.formula.get_free_variables()
-        return self.formula.is_free_for(term, var)
-
-    def _fresh_variable(self, used_vars: Set[str]) -> str:
-        """Generate a fresh variable name."""
-        base = self.variable
-        counter = 0
-        while f"{base}{counter}" in used_vars:
-            counter += 1
-        return f"{base}{counter}"
+        return _quant_is_free_for(self, term, var)
 
 
 class Existential(Formula):
     """Existential quantification ∃x.φ."""
 
-    def __init__(self, variable: str, formula: Formula):
-        self.variable = variable
-        self.formula = formula
+    __slots__ = ('variable', 'formula')
+    variable: str
+    formula: Formula
+    _tag: ClassVar[int] = 11
+
+    def __new__(cls, variable: str, formula: Formula):
+        variable = sys.intern(variable)
+        key = (cls, variable, id(formula))
+        self = _INTERN.get(key)
+        if self is None:
+            self = _new_node(cls, key)
+            self.variable = variable
+            self.formula = formula
+            self._hash = hash((cls._tag, variable, formula._hash))
+            self._fv = (formula._fv - {variable}) or _EMPTY
+        return self
 
-    def __str__(self) -> str:
+    def _format(self) -> str:
         return f"∃{self.variable}.{self.formula}"
 
-    def __eq__(self, other) -> bool:
-        return (isinstance(other, Existential) and
-                self.variable == other.variable and
-                self.formula == other.formula)
+    def get_free_variables(self) -> FrozenSet[str]:
+        return self._fv
 
-    def __hash__(self) -> int:
-        return hash(('Existential', self.variable, self.formula))
-
-    def get_free_variables(self) -> Set[str]:
-        free_vars = self.formula.get_free_variables()
-        return free_vars - {self.variable}
-
-    def substitute(self, var: str, term: Term) -> Formula:
-        if var == self.variable:
-            # Variable is bound, no substitution
-            return self
-        elif self.variable in term.get_variables():
-            # Need to rename bound variable to avoid capture
-            new_var = self._fresh_variable(term.get_variables() |
-                                           self.formula.get_free_variables())
-            renamed_formula = self.formula.substitute(self.variable, Variable(new_var))
-            return Existential(new_var, renamed_formula.substitute(var, term))
-        else:
-            return Existential(self.variable, self.formula.substitute(var, term))
+    def _substitute(self, var: str, term: Term) -> Formula:
+        return _quant_substitute(self, var, term, Existential)
 
     def is_free_for(self, term: Term, var: str) -> bool:
-        if var == self.variable:
-            return True
-        if self.variable in term.get_variables():
-            return var not in self.formula.get_free_variables()
-        return self.formula.is_free_for(term, var)
+        return _quant_is_free_for(self, term, var)
+
+
+# Identity-keyed containers
+
+def _uid_key(item) -> Optional[int]:
+    """Return the uid of a formula or term, or None for anything else."""
+    return item.uid if isinstance(item, (Formula, Term)) else None
+
+
+def _require_uid(item, what: str) -> int:
+    """Return the uid of item, which must be a formula or term."""
+    key = _uid_key(item)
+    if key is None:
+        raise TypeError(f"{what} must be formulas or terms, not {type(item).__name__}")
+    return key
+
+
+class IdSet(MutableSet):
+    """Set of formulas or terms keyed by uid."""
+
+    __slots__ = ('_items',)
+
+    def __init__(self, items=()):
+        self._items = {}
+        for item in items:
+            self.add(item)
+
+    def __contains__(self, item) -> bool:
+        return _uid_key(item) in self._items
 
-    def _fresh_variable(self, used_vars: Set[str]) -> str:
-        """Generate a fresh variable name."""
-        base = self.variable
-        counter = 0
-        while f"{base}{counter}" in used_vars:
-            counter += 1
-        return f"{base}{counter}"
+    def __iter__(self):
+        return iter(self._items.values())
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def add(self, item) -> None:
+        self._items[_require_uid(item, 'IdSet items')] = item
+
+    def discard(self, item) -> None:
+        self._items.pop(_uid_key(item), None)
+
+
+class IdDict(MutableMapping):
+    """Mapping from formulas or terms to values, keyed by uid."""
+
+    __slots__ = ('_items',)
+
+    def __init__(self, items=()):
+        self._items = {}
+        self.update(items)
+
+    def __getitem__(self, key):
+        entry = self._items.get(_uid_key(key))
+        if entry is None:
+            raise KeyError(key)
+        return entry[1]
+
+    def __setitem__(self, key, value) -> None:
+        self._items[_require_uid(key, 'IdDict keys')] = (key, value)
+
+    def __delitem__(self, key) -> None:
+        if self._items.pop(_uid_key(key), None) is None:
+            raise KeyError(key)
+
+    def __iter__(self):
+        return (key for key, _ in self._items.values())
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+# Master token pattern: leading whitespace is skipped inside the match, then a
+# connective or punctuation symbol, or an identifier (quantifier keywords
+# included). Any other character is 'bad'.
+_TOKEN_RE = re.compile(r"\s*(?:(?P<sym>->|[→∀∃⊥¬∧∨()&|~!.,_])"
+                       r"|(?P<ident>[^\W\d_][\w']*)"
+                       r"|(?P<bad>\S))")
+
+# A token is (kind, value, position); the final 'end' token has value ''
+_Token = Tuple[str, str, int]
+
+# Token spellings accepted for each operator
+_BOTTOM_SYMBOLS = frozenset(('⊥', '_'))
+_NEGATION_SYMBOLS = frozenset(('~', '¬', '!'))
+_CONJUNCTION_SYMBOLS = frozenset(('&', '∧'))
+_DISJUNCTION_SYMBOLS = frozenset(('|', '∨'))
+_IMPLICATION_SYMBOLS = frozenset(('->', '→'))
+_UNIVERSAL_SYMBOLS = frozenset(('forall', '∀'))
+_EXISTENTIAL_SYMBOLS = frozenset(('exists', '∃'))
 
 
 class FormulaParser:
-    """Recursive descent parser for formulas."""
+    """Recursive descent parser for formulas over a pre-tokenized input."""
+
+    def __init__(self) -> None:
+        self.text: str = ""
+        self.tokens: List[_Token] = []
+        self.i: int = 0
+        self.constants: Set[str] = set()  # Track encountered constants
 
-    def __init__(self):
+    def reset(self) -> None:
+        """Clear all parser state, including collected constants, for reuse."""
         self.text = ""
-        self.pos = 0
-        self.constants = set()  # Track encountered constants
+        self.tokens = []
+        self.i = 0
+        self.constants.clear()
 
     def parse(self, text: str) -> Formula:
         """Parse a formula from text string."""
         self.text = text.strip()
-        self.pos = 0
+        self.tokens = self._tokenize(self.text)
+        self.i = 0
         formula = self._parse_formula()
-        if self.pos < len(self.text):
-            raise ValueError(f"Unexpected characters after formula: {self.text[self.pos:]}")
+        if self.tokens[self.i][0] != 'end':
+            raise ValueError(f"Unexpected characters after formula: {self.text[self._position():]}")
         return formula
 
-    def _current(self) -> Optional[str]:
-        """Get current character without consuming."""
-        if self.pos < len(self.text):
-            return self.text[self.pos]
-        return None
-
-    def _consume(self, expected: Optional[str] = None) -> Optional[str]:
-        """Consume and return current character."""
-        if self.pos >= len(self.text):
-            if expected:
-                raise ValueError(f"Expected '{expected}' but reached end of input")
-            return None
+    def _tokenize(self, text: str) -> List[_Token]:
+        """Split text into (kind, value, position) tokens, ending with an 'end' token."""
+        tokens = []
+        for match in _TOKEN_RE.finditer(text):
+            kind = match.lastgroup
+            assert kind is not None  # Every alternative is a named group
+            if kind == 'bad':
+                raise ValueError(f"Unexpected character '{match.group(kind)}' at position {match.start(kind)}")
+            tokens.append((kind, match.group(kind), match.start(kind)))
+        tokens.append(('end', '', len(text)))
+        return tokens
+
+    def _current(self) -> str:
+        """Get current token without consuming."""
+        return self.tokens[self.i][1]
+
+    def _position(self) -> int:
+        """Get text position of the current token."""
+        return self.tokens[self.i][2]
+
+    def _consume_any(self) -> str:
+        """Consume and return current token (already checked by the caller)."""
+        value = self.tokens[self.i][1]
+        self.i += 1
+        return value
+
+    def _consume_expect(self, expected: str) -> None:
+        """Consume the current token, which must be expected."""
+        if self.tokens[self.i][1] != expected:
+            self._raise_expected(expected)
+        self.i += 1
+
+    def _raise_expected(self, expected: str) -> NoReturn:
+        """Raise the error for a missing expected token."""
+        kind, value, pos = self.tokens[self.i]
+        if kind == 'end':
+            raise ValueError(f"Expected '{expected}' but reached end of input")
+        raise ValueError(f"Expected '{expected}' but got '{value}' at position {pos}")
 
-        char = self.text[self.pos]
-        if expected and char != expected:
-            raise ValueError(f"Expected '{expected}' but got '{char}' at position {self.pos}")
+    def _parse_identifier(self) -> str:
+        """Parse an identifier (variable, constant, predicate, or function name)."""
+        kind, value, pos = self.tokens[self.i]
 
-        self.pos += 1
-        return char
+        # Regular identifiers, plus the special bottom symbols
+        if kind != 'ident' and value not in _BOTTOM_SYMBOLS:
+            raise ValueError(f"Expected identifier at position {pos}")
 
-    def _skip_whitespace(self):
-        """Skip whitespace characters."""
-        while self.pos < len(self.text) and self.text[self.pos].isspace():
-            self.pos += 1
+        self.i += 1
+        return sys.intern(value)
 
-    def _parse_identifier(self) -> str:
-        """Parse an identifier (variable, constant, predicate, or function name)."""
-        self._skip_whitespace()
-        start = self.pos
+    def _parse_arguments(self) -> List[Term]:
+        """Parse a parenthesized argument list after its opening '('."""
+        args = []
 
-        # Handle special bottom symbol
-        if self.text[self.pos:self.pos + 1] in ['⊥', '_']:
-            self.pos += 1
-            return self.text[start:self.pos]
+        while True:
+            if self._current() == ')':
+                break
 
-        # Regular identifier: letter followed by alphanumerics
-        if not self.text[self.pos].isalpha():
-            raise ValueError(f"Expected identifier at position {self.pos}")
+            args.append(self._parse_term())
 
-        while self.pos < len(self.text) and (self.text[self.pos].isalnum() or
-                                             self.text[self.pos] in ['_', '\'']):
-            self.pos += 1
+            if self._current() == ',':
+                self._consume_any()
+                # Check for trailing comma
+                if self._current() == ')':
+                    raise ValueError(f"Trailing comma in argument list at position {self._position()}")
+            elif self._current() == ')':
+                break
+            else:
+                raise ValueError(f"Expected ',' or ')' at position {self._position()}")
 
-        return self.text[start:self.pos]
+        self._consume_expect(')')
+        return args
 
     def _parse_term(self) -> Term:
         """Parse a term."""
-        self._skip_whitespace()
-
-        # Parse identifier
         name = self._parse_identifier()
-        self._skip_whitespace()
 
         # Check if it's a function application
         if self._current() == '(':
-            # Function application
-            self._consume('(')
-            args = []
-
-            while True:
-                self._skip_whitespace()
-                if self._current() == ')':
-                    break
-
-                args.append(self._parse_term())
-                self._skip_whitespace()
-
-                if self._current() == ',':
-                    self._consume(',')
-                    self._skip_whitespace()
-                    # Check for trailing comma
-                    if self._current() == ')':
-                        raise ValueError(f"Trailing comma in argument list at position {self.pos}")
-                elif self._current() == ')':
-                    break
-                else:
-                    raise ValueError(f"Expected ',' or ')' at position {self.pos}")
-
-            self._consume(')')
-            return FunctionApplication(name, args)
+            self._consume_any()
+            return FunctionApplication(name, self._parse_arguments())
         else:
             # Variable or constant
             # Simple heuristic: lowercase = variable, uppercase = constant
@@ -546,61 +797,29 @@ class FormulaParser:
                 self.constants.add(name)
                 return Constant(name)
 
+    def _parse_bottom(self) -> Formula:
+        """Parse the bottom symbol."""
+        self._consume_any()
+        return Bottom()
+
     def _parse_atomic(self) -> Formula:
         """Parse an atomic formula."""
-        self._skip_whitespace()
-
-        # Check for bottom
-        if self._current() in ['⊥', '_']:
-            self._consume()
-            return Bottom()
-
-        # Check for negation symbol at the start
-        if self._current() in ['~', '¬', '!']:
-            return self._parse_negation()
-
         # Parse identifier (predicate or start of term)
         name = self._parse_identifier()
-        self._skip_whitespace()
 
         # Check if it's a predicate with arguments
         if self._current() == '(':
-            self._consume('(')
-            args = []
-
-            while True:
-                self._skip_whitespace()
-                if self._current() == ')':
-                    break
-
-                args.append(self._parse_term())
-                self._skip_whitespace()
-
-                if self._current() == ',':
-                    self._consume(',')
-                    self._skip_whitespace()
-                    # Check for trailing comma
-                    if self._current() == ')':
-                        raise ValueError(f"Trailing comma in argument list at position {self.pos}")
-                elif self._current() == ')':
-                    break
-                else:
-                    raise ValueError(f"Expected ',' or ')' at position {self.pos}")
-
-            self._consume(')')
-            return AtomicFormula(name, args)
+            self._consume_any()
+            return AtomicFormula(name, self._parse_arguments())
         else:
             # Propositional atom (0-ary predicate)
             # Typically lowercase letters like p, q, r
-            return AtomicFormula(name, [])
+            return AtomicFormula(name)
 
     def _parse_negation(self) -> Formula:
         """Parse a negation."""
-        self._skip_whitespace()
-
-        if self._current() in ['~', '¬', '!']:
-            self._consume()
-            self._skip_whitespace()
+        if self._current() in _NEGATION_SYMBOLS:
+            self._consume_any()
 
             # Parse the negated formula
             formula = self._parse_primary()
@@ -609,73 +828,62 @@ class FormulaParser:
         return self._parse_primary()
 
     def _parse_primary(self) -> Formula:
-        """Parse a primary formula (atomic, quantified, or parenthesized)."""
-        self._skip_whitespace()
-
-        # Check for parentheses
-        if self._current() == '(':
-            self._consume('(')
-            formula = self._parse_formula()
-            self._skip_whitespace()
-            self._consume(')')
-            return formula
-
-        # Check for quantifiers
-        if self.text[self.pos:self.pos + 6] == 'forall':
-            self.pos += 6
-            return self._parse_universal()
-        elif self.text[self.pos:self.pos + 6] == 'exists':
-            self.pos += 6
-            return self._parse_existential()
-        elif self._current() == '∀':
-            self._consume()
-            return self._parse_universal()
-        elif self._current() == '∃':
-            self._consume()
-            return self._parse_existential()
+        """Parse a primary formula (atomic, negated, quantified, or parenthesized)."""
+        # Dispatch on the first token
+        handler = _PRIMARY_DISPATCH.get(self._current())
+        if handler is not None:
+            return handler(self)
+
+        # A quantifier keyword run together with its variable ("forallx") is
+        # split into the two tokens it stands for; a remainder that cannot
+        # start a variable name ("forall1") is left to fail as one
+        kind, value, pos = self.tokens[self.i]
+        keyword = value[:6] if kind == 'ident' else None
+        if keyword in _UNIVERSAL_SYMBOLS or keyword in _EXISTENTIAL_SYMBOLS:
+            rest = value[6:]
+            rest_kind = 'ident' if rest[:1].isalpha() else 'bad'
+            self.tokens[self.i:self.i + 1] = [(kind, keyword, pos), (rest_kind, rest, pos + 6)]
+            return _PRIMARY_DISPATCH[keyword](self)
 
         # Otherwise, parse atomic
         return self._parse_atomic()
 
+    def _parse_parenthesized(self) -> Formula:
+        """Parse a parenthesized formula."""
+        self._consume_any()  # '(' (dispatched on)
+        formula = self._parse_formula()
+        self._consume_expect(')')
+        return formula
+
     def _parse_universal(self) -> Formula:
         """Parse universal quantification."""
-        self._skip_whitespace()
+        self._consume_any()  # Quantifier symbol
         var = self._parse_identifier()
 
         # Check if the identifier looks like a predicate (uppercase)
         # This would be invalid syntax like "forall P(x)"
-        if var[0].isupper():
-            # Check if there's a parenthesis following
-            self._skip_whitespace()
-            if self._current() == '(':
-                raise ValueError(f"Invalid quantifier syntax: cannot quantify over predicate '{var}'")
-
-        self._skip_whitespace()
+        if var[0].isupper() and self._current() == '(':
+            raise ValueError(f"Invalid quantifier syntax: cannot quantify over predicate '{var}'")
 
         # Accept either '.' or no separator
         if self._current() == '.':
-            self._consume('.')
+            self._consume_any()
 
         formula = self._parse_formula()
         return Universal(var, formula)
 
     def _parse_existential(self) -> Formula:
         """Parse existential quantification."""
-        self._skip_whitespace()
+        self._consume_any()  # Quantifier symbol
         var = self._parse_identifier()
 
         # Check if the identifier looks like a predicate (uppercase)
-        if var[0].isupper():
-            # Check if there's a parenthesis following
-            self._skip_whitespace()
-            if self._current() == '(':
-                raise ValueError(f"Invalid quantifier syntax: cannot quantify over predicate '{var}'")
-
-        self._skip_whitespace()
+        if var[0].isupper() and self._current() == '(':
+            raise ValueError(f"Invalid quantifier syntax: cannot quantify over predicate '{var}'")
 
         # Accept either '.' or no separator
         if self._current() == '.':
-            self._consume('.')
+            self._consume_any()
 
         formula = self._parse_formula()
         return Existential(var, formula)
@@ -688,15 +896,10 @@ class FormulaParser:
     def _parse_implication(self) -> Formula:
         """Parse implication (right-associative)."""
         left = self._parse_disjunction()
-        self._skip_whitespace()
 
         # Check for implication operator
-        if self.text[self.pos:self.pos + 2] == '->':
-            self.pos += 2
-            right = self._parse_implication()  # Right-associative
-            return Implication(left, right)
-        elif self._current() == '→':
-            self._consume()
+        if self._current() in _IMPLICATION_SYMBOLS:
+            self._consume_any()
             right = self._parse_implication()  # Right-associative
             return Implication(left, right)
 
@@ -706,15 +909,10 @@ class FormulaParser:
         """Parse disjunction (left-associative)."""
         left = self._parse_conjunction()
 
-        while True:
-            self._skip_whitespace()
-
-            if self._current() in ['|', '∨']:
-                self._consume()
-                right = self._parse_conjunction()
-                left = Disjunction(left, right)
-            else:
-                break
+        while self._current() in _DISJUNCTION_SYMBOLS:
+            self._consume_any()
+            right = self._parse_conjunction()
+            left = Disjunction(left, right)
 
         return left
 
@@ -722,19 +920,24 @@ class FormulaParser:
         """Parse conjunction (left-associative)."""
         left = self._parse_negation()
 
-        while True:
-            self._skip_whitespace()
-
-            if self._current() in ['&', '∧']:
-                self._consume()
-                right = self._parse_negation()
-                left = Conjunction(left, right)
-            else:
-                break
+        while self._current() in _CONJUNCTION_SYMBOLS:
+            self._consume_any()
+            right = self._parse_negation()
+            left = Conjunction(left, right)
 
         return left
 
 
+# Handlers for _parse_primary keyed by first token; anything else is atomic
+_PRIMARY_DISPATCH = {
+    '(': FormulaParser._parse_parenthesized,
+    **dict.fromkeys(_BOTTOM_SYMBOLS, FormulaParser._parse_bottom),
+    **dict.fromkeys(_NEGATION_SYMBOLS, FormulaParser._parse_negation),
+    **dict.fromkeys(_UNIVERSAL_SYMBOLS, FormulaParser._parse_universal),
+    **dict.fromkeys(_EXISTENTIAL_SYMBOLS, FormulaParser._parse_existential),
+}
+
+
 # Helper function for easy parsing
 def parse(text: str) -> Formula:
     """Parse a formula from a string."""
@@ -742,6 +945,19 @@ def parse(text: str) -> Formula:
     return parser.parse(text)
 
 
+def parse_many(texts: Sequence[str]) -> List[Formula]:
+    """Parse a batch of formulas with a single parser, reset between formulas.
+
+    Results are in input order; the first formula that fails to parse raises.
+    """
+    parser = FormulaParser()
+    formulas = []
+    for text in texts:
+        parser.reset()
+        formulas.append(parser.parse(text))
+    return formulas
+
+
 # Example usage and testing
 if __name__ == "__main__":
     # Test propositional formulas
@@ -792,7 +1008,7 @@ if __name__ == "__main__":
             formula = parse(test)
             print(f"Input:  {test}")
             print(f"Parsed: {formula}")
-            print(f"Free:   {formula.get_free_variables()}")
+            print(f"Free:   {set(formula.get_free_variables())}")
             print()
         except Exception as e:
             print(f"Error parsing '{test}': {e}")
@@ -10,7 +10,8 @@ from .formula import (
     Variable, Constant, FunctionApplication,
     AtomicFormula, Bottom, Negation, Conjunction,
     Disjunction, Implication, Universal, Existential,
-    FormulaParser, parse
+    IdSet, IdDict,
+    FormulaParser, parse, parse_many
 )
 
 __version__ = "0.1.0"
@@ -21,5 +22,6 @@ __all__ = [
     'Variable', 'Constant', 'FunctionApplication',
     'AtomicFormula', 'Bottom', 'Negation', 'Conjunction',
     'Disjunction', 'Implication', 'Universal', 'Existential',
-    'FormulaParser', 'parse'
+    'IdSet', 'IdDict',
+    'FormulaParser', 'parse', 'parse_many'
 ]
\ No newline at end of file
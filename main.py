@@ -8,35 +8,172 @@ following van Dalen's natural deduction system.
 """
 
 import sys
-from formula import parse, Formula
+
+
+_WELCOME_TEXT = "\n".join([
+    "=" * 60,
+    "Natural Deduction Proof Assistant",
+    "Based on van Dalen's Logic and Structure",
+    "=" * 60,
+    "\nType 'help' for available commands.",
+]) + "\n"
+
+_HELP_TEXT = "\n".join([
+    "\nAvailable Commands:",
+    "-" * 40,
+    "  parse <formula>  - Parse and display a formula",
+    "  list            - List all stored formulas",
+    "  clear           - Clear all stored formulas",
+    "  test            - Run example formulas",
+    "  help            - Show this help message",
+    "  quit            - Exit the program",
+    "\nFormula Syntax:",
+    "-" * 40,
+    "Propositional:",
+    "  Atoms:        p, q, r, ...",
+    "  Negation:     ~p or ¬p or !p",
+    "  Conjunction:  p & q or p ∧ q",
+    "  Disjunction:  p | q or p ∨ q",
+    "  Implication:  p -> q or p → q",
+    "  Bottom:       ⊥ or _",
+    "\nFirst-Order:",
+    "  Predicates:   P(x), Q(x,y), ...",
+    "  Universal:    forall x. P(x) or ∀x. P(x)",
+    "  Existential:  exists x. P(x) or ∃x. P(x)",
+    "  Functions:    f(x), g(x,y), ...",
+]) + "\n"
+
+# Example formulas shown by the 'test' command; the formula strings are
+# interned since they are also the keys they are cached under
+_PROP_EXAMPLES = tuple((name, sys.intern(text)) for name, text in (
+    ("Simple atom", "p"),
+    ("Negation", "~p"),
+    ("Conjunction", "p & q"),
+    ("Disjunction", "p | q"),
+    ("Implication", "p -> q"),
+    ("Modus ponens", "(p & (p -> q)) -> q"),
+    ("De Morgan", "~(p & q) -> (~p | ~q)"),
+    ("Contraposition", "(p -> q) -> (~q -> ~p)"),
+    ("Bottom elimination", "⊥ -> p"),
+    ("Double negation", "p -> ~~p"),
+))
+
+_FOL_EXAMPLES = tuple((name, sys.intern(text)) for name, text in (
+    ("Predicate", "P(x)"),
+    ("Binary relation", "R(x, y)"),
+    ("Universal", "forall x. P(x)"),
+    ("Existential", "exists x. P(x)"),
+    ("Universal conditional", "forall x. (P(x) -> Q(x))"),
+    ("Existential conjunction", "exists x. (P(x) & Q(x))"),
+    ("Nested quantifiers", "forall x. exists y. R(x, y)"),
+    ("Function application", "P(f(x))"),
+    ("Complex", "forall x. (P(x) -> exists y. R(x, y))"),
+    ("Unicode quantifiers", "∀x. ∃y. R(x, y)"),
+))
+
+
+def _store_bounded(cache: dict, size: int, key, value) -> None:
+    """Store value under key, first evicting the oldest entry if cache holds size entries."""
+    if len(cache) >= size:
+        del cache[next(iter(cache))]
+    cache[key] = value
+
+
+# Parsed formulas keyed by interned source text, bounded to the most recent entries
+_PARSE_CACHE_SIZE = 256
+_parse_cache = {}
+
+
+def _cached_parse(text: str):
+    """Parse text, reusing the result of an earlier parse of the same string."""
+    formula = _parse_cache.get(text)
+    if formula is None:
+        # Imported on first use, so startup and commands like 'help' or
+        # 'quit' never load the parser
+        from formula import parse
+        formula = parse(text)
+        _store_bounded(_parse_cache, _PARSE_CACHE_SIZE, sys.intern(text), formula)
+    return formula
+
+
+def _parse_examples(examples):
+    """Parse (name, text) examples, returning (name, text, error) with error None on success."""
+    results = []
+    for name, formula_text in examples:
+        try:
+            _cached_parse(formula_text)
+            results.append((name, formula_text, None))
+        except Exception as e:
+            results.append((name, formula_text, e))
+    return results
+
+
+def _format_examples(results, width):
+    """Format parsed examples as one line each, padding the formula to width."""
+    return "\n".join(name.ljust(20) + ' ' + formula_text.ljust(width)
+                     + (' ✓' if error is None else f' ✗ ({error})')
+                     for name, formula_text, error in results)
+
+
+# Sorted display text for free-variable sets, keyed by the (immutable) set
+# itself and bounded to the most recent entries
+_FREE_VARS_CACHE_SIZE = 256
+_free_vars_cache = {}
+
+
+def _free_vars_text(free_vars) -> str:
+    """Return free_vars as sorted, comma-separated text, reusing earlier results."""
+    text = _free_vars_cache.get(free_vars)
+    if text is None:
+        text = ', '.join(sorted(free_vars))
+        _store_bounded(_free_vars_cache, _FREE_VARS_CACHE_SIZE, free_vars, text)
+    return text
+
+
+# Returned by a command handler to stop the interactive loop
+_QUIT = object()
 
 
 class ProofAssistant:
     """Main proof assistant application."""
 
+    __slots__ = ('current_proof', 'formulas', '_cmds')
+
     def __init__(self):
         self.current_proof = None
         self.formulas = {}  # Store parsed formulas by name
+        # Commands without arguments, mapped to their handlers
+        self._cmds = {
+            'quit': self._quit, 'exit': self._quit, 'q': self._quit,
+            'help': self.print_help, 'h': self.print_help, '?': self.print_help,
+            'list': self.list_formulas,
+            'clear': self.clear_formulas,
+        }
 
     def run(self):
         """Run the interactive proof assistant."""
+        # Line editing and history for input(); only the interactive loop
+        # needs it, and some platforms lack the module
+        try:
+            import readline  # noqa: F401
+        except ImportError:
+            pass
+
         self.print_welcome()
 
         while True:
             try:
-                command = input("\n> ").strip().lower()
-
-                if command in ['quit', 'exit', 'q']:
-                    print("Goodbye!")
-                    break
-                elif command in ['help', 'h', '?']:
-                    self.print_help()
-                elif command.startswith('parse '):
-                    self.parse_formula(command[6:])
-                elif command == 'list':
-                    self.list_formulas()
-                elif command == 'clear':
-                    self.clear_formulas()
+                raw = input("\n> ").strip()
+                # Command words are case-insensitive, formula text is not
+                command = raw if raw.islower() else raw.lower()
+
+                handler = self._cmds.get(command)
+                if handler is not None:
+                    if handler() is _QUIT:
+                        break
+                # removeprefix() hands back the same object when the prefix is absent
+                elif (rest := command.removeprefix('parse ')) is not command:
+                    self.parse_formula(rest if command is raw else raw[6:])
                 elif command.startswith('test'):
                     self.run_tests()
                 else:
@@ -47,39 +184,22 @@ class ProofAssistant:
                 print("\nUse 'quit' to exit.")
             except Exception as e:
                 print(f"Error: {e}")
+            finally:
+                # Output is block-buffered (see main()); show it once per command
+                sys.stdout.flush()
+
+    def _quit(self):
+        """Say goodbye and stop the interactive loop."""
+        print("Goodbye!")
+        return _QUIT
 
     def print_welcome(self):
         """Print welcome message."""
-        print("=" * 60)
-        print("Natural Deduction Proof Assistant")
-        print("Based on van Dalen's Logic and Structure")
-        print("=" * 60)
-        print("\nType 'help' for available commands.")
+        sys.stdout.write(_WELCOME_TEXT)
 
     def print_help(self):
         """Print help message."""
-        print("\nAvailable Commands:")
-        print("-" * 40)
-        print("  parse <formula>  - Parse and display a formula")
-        print("  list            - List all stored formulas")
-        print("  clear           - Clear all stored formulas")
-        print("  test            - Run example formulas")
-        print("  help            - Show this help message")
-        print("  quit            - Exit the program")
-        print("\nFormula Syntax:")
-        print("-" * 40)
-        print("Propositional:")
-        print("  Atoms:        p, q, r, ...")
-        print("  Negation:     ~p or ¬p or !p")
-        print("  Conjunction:  p & q or p ∧ q")
-        print("  Disjunction:  p | q or p ∨ q")
-        print("  Implication:  p -> q or p → q")
-        print("  Bottom:       ⊥ or _")
-        print("\nFirst-Order:")
-        print("  Predicates:   P(x), Q(x,y), ...")
-        print("  Universal:    forall x. P(x) or ∀x. P(x)")
-        print("  Existential:  exists x. P(x) or ∃x. P(x)")
-        print("  Functions:    f(x), g(x,y), ...")
+        sys.stdout.write(_HELP_TEXT)
 
     def parse_formula(self, formula_text: str):
         """Parse and display a formula."""
@@ -88,7 +208,7 @@ class ProofAssistant:
             return
 
         try:
-            formula = parse(formula_text)
+            formula = _cached_parse(formula_text)
 
             # Store the formula with a generated name
             name = f"f{len(self.formulas) + 1}"
@@ -100,14 +220,19 @@ class ProofAssistant:
 
             # Show additional information for formulas with variables
             free_vars = formula.get_free_variables()
-            if free_vars:
-                print(f"  Free vars: {', '.join(sorted(free_vars))}")
+            if len(free_vars) == 1:
+                # No ordering to do for a single variable
+                print(f"  Free vars: {next(iter(free_vars))}")
+            elif free_vars:
+                print(f"  Free vars: {_free_vars_text(free_vars)}")
 
             # Show structure for complex formulas
-            if hasattr(formula, 'left') and hasattr(formula, 'right'):
+            # Imported here rather than at startup, like parse in _cached_parse
+            from formula import Negation, Conjunction, Disjunction, Universal, Existential
+            if isinstance(formula, (Conjunction, Disjunction)):
                 print(f"  Left:     {formula.left}")
                 print(f"  Right:    {formula.right}")
-            elif hasattr(formula, 'formula'):
+            elif isinstance(formula, (Negation, Universal, Existential)):
                 print(f"  Subformula: {formula.formula}")
 
         except Exception as e:
@@ -131,63 +256,35 @@ class ProofAssistant:
 
     def run_tests(self):
         """Run example formulas to demonstrate the parser."""
-        print("\nRunning Example Formulas...")
-        print("=" * 50)
-
-        # Propositional logic examples
-        prop_examples = [
-            ("Simple atom", "p"),
-            ("Negation", "~p"),
-            ("Conjunction", "p & q"),
-            ("Disjunction", "p | q"),
-            ("Implication", "p -> q"),
-            ("Modus ponens", "(p & (p -> q)) -> q"),
-            ("De Morgan", "~(p & q) -> (~p | ~q)"),
-            ("Contraposition", "(p -> q) -> (~q -> ~p)"),
-            ("Bottom elimination", "⊥ -> p"),
-            ("Double negation", "p -> ~~p")
-        ]
-
-        print("\nPropositional Logic:")
-        print("-" * 40)
-        for name, formula_text in prop_examples:
-            try:
-                formula = parse(formula_text)
-                print(f"{name:20} {formula_text:25} ✓")
-            except Exception as e:
-                print(f"{name:20} {formula_text:25} ✗ ({e})")
-
-        # First-order logic examples
-        fol_examples = [
-            ("Predicate", "P(x)"),
-            ("Binary relation", "R(x, y)"),
-            ("Universal", "forall x. P(x)"),
-            ("Existential", "exists x. P(x)"),
-            ("Universal conditional", "forall x. (P(x) -> Q(x))"),
-            ("Existential conjunction", "exists x. (P(x) & Q(x))"),
-            ("Nested quantifiers", "forall x. exists y. R(x, y)"),
-            ("Function application", "P(f(x))"),
-            ("Complex", "forall x. (P(x) -> exists y. R(x, y))"),
-            ("Unicode quantifiers", "∀x. ∃y. R(x, y)")
-        ]
-
-        print("\nFirst-Order Logic:")
-        print("-" * 40)
-        for name, formula_text in fol_examples:
-            try:
-                formula = parse(formula_text)
-                print(f"{name:20} {formula_text:35} ✓")
-            except Exception as e:
-                print(f"{name:20} {formula_text:35} ✗ ({e})")
+        # Parse everything first, then write the report in one go
+        prop_results = _parse_examples(_PROP_EXAMPLES)
+        fol_results = _parse_examples(_FOL_EXAMPLES)
+
+        sys.stdout.write("\n".join([
+            "\nRunning Example Formulas...",
+            "=" * 50,
+            "\nPropositional Logic:",
+            "-" * 40,
+            _format_examples(prop_results, 25),
+            "\nFirst-Order Logic:",
+            "-" * 40,
+            _format_examples(fol_results, 35),
+        ]) + "\n")
 
 
 def main():
     """Main entry point."""
+    # Don't flush on every newline; the REPL flushes after each command instead
+    reconfigure = getattr(sys.stdout, 'reconfigure', None)
+    if reconfigure is not None:
+        reconfigure(line_buffering=False, write_through=False)
+
     assistant = ProofAssistant()
 
     # If arguments provided, parse them as formulas
     if len(sys.argv) > 1:
-        formula_text = ' '.join(sys.argv[1:])
+        # A shell-quoted formula arrives as one argument and needs no joining
+        formula_text = sys.argv[1] if len(sys.argv) == 2 else ' '.join(sys.argv[1:])
         print(f"Parsing: {formula_text}")
         assistant.parse_formula(formula_text)
     else:
@@ -4,205 +4,501 @@ Test suite for the Natural Deduction formula parser.
 Tests both propositional and first-order logic formulas.
 """
 
-from formula import parse, Formula, AtomicFormula, Negation, Conjunction, Disjunction, Implication, Bottom, Universal, \
-    Existential, Variable, Constant
-
-
-def test_propositional_logic():
+import copy
+import gc
+import pickle
+import sys
+
+from formula import parse, parse_many, Formula, AtomicFormula, Negation, Conjunction, Disjunction, Implication, Bottom, Universal, \
+    Existential, Variable, Constant, IdSet, IdDict, FormulaParser
+
+
+# Underline printed beneath each suite heading
+_RULE = "=" * 50
+
+# Test cases for each suite, kept at module level so main() can parse every
+# distinct formula string once and share the results across suites
+
+_PROPOSITIONAL_TESTS = [
+    # Basic atoms
+    ("p", AtomicFormula),
+    ("q", AtomicFormula),
+    ("prop1", AtomicFormula),
+
+    # Bottom
+    ("⊥", Bottom),
+    ("_", Bottom),
+
+    # Negation
+    ("~p", Negation),
+    ("¬p", Negation),
+    ("!p", Negation),
+
+    # Binary connectives
+    ("p & q", Conjunction),
+    ("p ∧ q", Conjunction),
+    ("p | q", Disjunction),
+    ("p ∨ q", Disjunction),
+    ("p -> q", Implication),
+    ("p → q", Implication),
+
+    # Complex formulas
+    ("(p & q) -> r", Implication),
+    ("p -> (q -> r)", Implication),
+    ("~(p & q)", Negation),
+    ("(p | q) & (r | s)", Conjunction),
+
+    # Classical theorems
+    ("p -> ~~p", Implication),  # Double negation introduction
+    ("⊥ -> p", Implication),  # Ex falso
+    ("(p -> q) -> (~q -> ~p)", Implication),  # Contraposition
+]
+
+_FIRST_ORDER_TESTS = [
+    # Basic predicates
+    ("P(x)", AtomicFormula),
+    ("Q(x, y)", AtomicFormula),
+    ("R(x, y, z)", AtomicFormula),
+
+    # Quantifiers
+    ("forall x. P(x)", Universal),
+    ("∀x. P(x)", Universal),
+    ("exists x. P(x)", Existential),
+    ("∃x. P(x)", Existential),
+    ("forallx. P(x)", Universal),  # Keyword run together with its variable
+    ("existsx. P(x)", Existential),
+
+    # Nested quantifiers
+    ("forall x. exists y. R(x, y)", Universal),
+    ("∀x. ∀y. P(x, y)", Universal),
+    ("∃x. ∃y. Q(x, y)", Existential),
+
+    # Quantifiers with complex formulas
+    ("forall x. (P(x) -> Q(x))", Universal),
+    ("exists x. (P(x) & Q(x))", Existential),
+    ("∀x. (P(x) → ∃y. R(x, y))", Universal),
+
+    # Functions
+    ("P(f(x))", AtomicFormula),
+    ("Q(f(x), g(y))", AtomicFormula),
+    ("R(f(g(x)))", AtomicFormula),
+]
+
+_FREE_VARIABLE_TESTS = [
+    ("P(x)", {"x"}),
+    ("P(x) & Q(y)", {"x", "y"}),
+    ("forall x. P(x)", set()),
+    ("exists x. P(x)", set()),
+    ("forall x. P(x, y)", {"y"}),
+    ("∀x. (P(x) → Q(y))", {"y"}),
+    ("(∀x. P(x)) → Q(y)", {"y"}),
+    ("∃x. ∀y. R(x, y, z)", {"z"}),
+]
+
+# Term used for substitution
+_C_CONST = Constant("c")
+
+# Normalize string for comparison (handle C vs c)
+_FOLD_C = str.maketrans("c", "C")
+
+_SUBSTITUTION_TESTS = [
+    # Simple substitution
+    ("P(x)", "x", _C_CONST, "P(C)"),
+    ("P(x) & Q(x)", "x", _C_CONST, "(P(C) ∧ Q(C))"),
+
+    # No substitution (variable not present)
+    ("P(y)", "x", _C_CONST, "P(y)"),
+
+    # Bound variable (no substitution inside quantifier)
+    ("forall x. P(x)", "x", _C_CONST, "∀x.P(x)"),
+    ("exists x. P(x)", "x", _C_CONST, "∃x.P(x)"),
+
+    # Free occurrence outside quantifier
+    ("(forall x. P(x)) & Q(x)", "x", _C_CONST, "(∀x.P(x) ∧ Q(C))"),
+]
+
+_INVALID_FORMULAS = (
+    "",
+    "p &",
+    "& q",
+    "p -> ",
+    "(p",
+    "p)",
+    "((p)",
+    "forall P(x)",
+    "exists . P(x)",
+    "P(x,)",
+    "P(,y)",
+)
+
+
+def _safe_parse(text, parsed):
+    """Return (formula, None) for text, or (None, error) if it does not parse.
+
+    Formulas already in ``parsed`` are reused; anything else is parsed anew
+    so a failure reports its own error.
+    """
+    formula = parsed.get(text)
+    if formula is not None:
+        return formula, None
+    try:
+        return parse(text), None
+    except Exception as e:
+        return None, e
+
+
+def _parse_all(texts):
+    """Parse each distinct formula string once; strings that fail are left out."""
+    parsed = {}
+    for text in texts:
+        if text not in parsed:
+            formula, _ = _safe_parse(text, parsed)
+            if formula is not None:
+                parsed[text] = formula
+    return parsed
+
+
+def test_propositional_logic(parsed=None):
     """Test parsing of propositional logic formulas."""
     print("Testing Propositional Logic")
-    print("=" * 50)
+    print(_RULE)
 
-    tests = [
-        # Basic atoms
-        ("p", AtomicFormula),
-        ("q", AtomicFormula),
-        ("prop1", AtomicFormula),
-
-        # Bottom
-        ("⊥", Bottom),
-        ("_", Bottom),
-
-        # Negation
-        ("~p", Negation),
-        ("¬p", Negation),
-        ("!p", Negation),
-
-        # Binary connectives
-        ("p & q", Conjunction),
-        ("p ∧ q", Conjunction),
-        ("p | q", Disjunction),
-        ("p ∨ q", Disjunction),
-        ("p -> q", Implication),
-        ("p → q", Implication),
-
-        # Complex formulas
-        ("(p & q) -> r", Implication),
-        ("p -> (q -> r)", Implication),
-        ("~(p & q)", Negation),
-        ("(p | q) & (r | s)", Conjunction),
-
-        # Classical theorems
-        ("p -> ~~p", Implication),  # Double negation introduction
-        ("⊥ -> p", Implication),  # Ex falso
-        ("(p -> q) -> (~q -> ~p)", Implication),  # Contraposition
-    ]
+    if parsed is None:
+        parsed = _parse_all(test[0] for test in _PROPOSITIONAL_TESTS)
 
     passed = 0
     failed = 0
 
-    for formula_text, expected_type in tests:
-        try:
-            formula = parse(formula_text)
-            if isinstance(formula, expected_type):
-                print(f"✓ {formula_text:30} -> {formula}")
-                passed += 1
-            else:
-                print(f"✗ {formula_text:30} -> Wrong type: {type(formula).__name__}")
-                failed += 1
-        except Exception as e:
-            print(f"✗ {formula_text:30} -> Error: {e}")
+    results = [(formula_text, expected_type, *_safe_parse(formula_text, parsed))
+               for formula_text, expected_type in _PROPOSITIONAL_TESTS]
+
+    rows = []
+    for formula_text, expected_type, formula, error in results:
+        if error is not None:
+            rows.append(f"✗ {formula_text.ljust(30)} -> Error: {error}")
             failed += 1
+        # Parser results are exact node classes, never subclasses
+        elif type(formula) is expected_type:
+            rows.append(f"✓ {formula_text.ljust(30)} -> {formula}")
+            passed += 1
+        else:
+            tn = type(formula).__name__
+            rows.append(f"✗ {formula_text.ljust(30)} -> Wrong type: {tn}")
+            failed += 1
+    sys.stdout.write("\n".join(rows) + "\n")
 
     print(f"\nResults: {passed} passed, {failed} failed")
     return passed, failed
 
 
-def test_first_order_logic():
+def test_first_order_logic(parsed=None):
     """Test parsing of first-order logic formulas."""
     print("\nTesting First-Order Logic")
-    print("=" * 50)
+    print(_RULE)
+
+    if parsed is None:
+        parsed = _parse_all(test[0] for test in _FIRST_ORDER_TESTS)
+
+    passed = 0
+    failed = 0
+
+    results = [(formula_text, expected_type, *_safe_parse(formula_text, parsed))
+               for formula_text, expected_type in _FIRST_ORDER_TESTS]
+
+    rows = []
+    for formula_text, expected_type, formula, error in results:
+        if error is not None:
+            rows.append(f"✗ {formula_text.ljust(35)} -> Error: {error}")
+            failed += 1
+        # Parser results are exact node classes, never subclasses
+        elif type(formula) is expected_type:
+            rows.append(f"✓ {formula_text.ljust(35)} -> {formula}")
+            passed += 1
+        else:
+            tn = type(formula).__name__
+            rows.append(f"✗ {formula_text.ljust(35)} -> Wrong type: {tn}")
+            failed += 1
+    sys.stdout.write("\n".join(rows) + "\n")
+
+    print(f"\nResults: {passed} passed, {failed} failed")
+    return passed, failed
+
+
+def test_free_variables(parsed=None):
+    """Test free variable detection."""
+    print("\nTesting Free Variables")
+    print(_RULE)
+
+    if parsed is None:
+        parsed = _parse_all(test[0] for test in _FREE_VARIABLE_TESTS)
+
+    passed = 0
+    failed = 0
+
+    results = [(formula_text, expected_vars, *_safe_parse(formula_text, parsed))
+               for formula_text, expected_vars in _FREE_VARIABLE_TESTS]
+
+    rows = []
+    for formula_text, expected_vars, formula, error in results:
+        if error is not None:
+            rows.append(f"✗ {formula_text:30} -> Error: {error}")
+            failed += 1
+            continue
+        free_vars = formula.get_free_variables()
+        if free_vars == expected_vars:
+            # Shown as a plain set, as before free variables became frozensets
+            rows.append(f"✓ {formula_text:30} -> {set(free_vars)}")
+            passed += 1
+        else:
+            rows.append(f"✗ {formula_text:30} -> Got {set(free_vars)}, expected {expected_vars}")
+            failed += 1
+    sys.stdout.write("\n".join(rows) + "\n")
+
+    print(f"\nResults: {passed} passed, {failed} failed")
+    return passed, failed
+
+
+def test_substitution(parsed=None):
+    """Test substitution in formulas."""
+    print("\nTesting Substitution")
+    print(_RULE)
+
+    if parsed is None:
+        parsed = _parse_all(test[0] for test in _SUBSTITUTION_TESTS)
+
+    passed = 0
+    failed = 0
+
+    results = [(formula_text, var, term, expected_result, *_safe_parse(formula_text, parsed))
+               for formula_text, var, term, expected_result in _SUBSTITUTION_TESTS]
+
+    rows = []
+    for formula_text, var, term, expected_result, formula, error in results:
+        if error is None:
+            try:
+                result = formula.substitute(var, term)
+            except Exception as e:
+                error = e
+        if error is not None:
+            rows.append(f"✗ {formula_text:25} -> Error: {error}")
+            failed += 1
+            continue
+        expected_folded = expected_result.translate(_FOLD_C)
+        if str(result).translate(_FOLD_C) == expected_folded:
+            rows.append(f"✓ {formula_text:25} [{var}/{term}] -> {result}")
+            passed += 1
+        else:
+            rows.append(f"✗ {formula_text:25} [{var}/{term}] -> Got {result}, expected {expected_result}")
+            failed += 1
+    sys.stdout.write("\n".join(rows) + "\n")
+
+    print(f"\nResults: {passed} passed, {failed} failed")
+    return passed, failed
+
+
+def test_fresh_variables():
+    """Test that capture-avoiding renaming is the same on every run."""
+    print("\nTesting Fresh Variables")
+    print(_RULE)
 
     tests = [
-        # Basic predicates
-        ("P(x)", AtomicFormula),
-        ("Q(x, y)", AtomicFormula),
-        ("R(x, y, z)", AtomicFormula),
-
-        # Quantifiers
-        ("forall x. P(x)", Universal),
-        ("∀x. P(x)", Universal),
-        ("exists x. P(x)", Existential),
-        ("∃x. P(x)", Existential),
-
-        # Nested quantifiers
-        ("forall x. exists y. R(x, y)", Universal),
-        ("∀x. ∀y. P(x, y)", Universal),
-        ("∃x. ∃y. Q(x, y)", Existential),
-
-        # Quantifiers with complex formulas
-        ("forall x. (P(x) -> Q(x))", Universal),
-        ("exists x. (P(x) & Q(x))", Existential),
-        ("∀x. (P(x) → ∃y. R(x, y))", Universal),
-
-        # Functions
-        ("P(f(x))", AtomicFormula),
-        ("Q(f(x), g(y))", AtomicFormula),
-        ("R(f(g(x)))", AtomicFormula),
+        ("forall y. P(x, y)", "x", Variable("y"), "∀y0.P(y, y0)"),
+        ("exists z. Q(x, z, z0)", "x", Variable("z"), "∃z1.Q(z, z1, z0)"),
     ]
 
     passed = 0
     failed = 0
 
-    for formula_text, expected_type in tests:
+    rows = []
+    for formula_text, var, term, expected_result in tests:
         try:
-            formula = parse(formula_text)
-            if isinstance(formula, expected_type):
-                print(f"✓ {formula_text:35} -> {formula}")
+            first = str(parse(formula_text).substitute(var, term))
+            # Rename the same bound variable elsewhere and drop every cached
+            # node, so the second run cannot reuse the first one's result
+            parse(f"forall {term}. R(w, {term})").substitute("w", term)
+            gc.collect()
+            second = str(parse(formula_text).substitute(var, term))
+            if first == second == expected_result:
+                rows.append(f"✓ {formula_text:25} [{var}/{term}] -> {second}")
                 passed += 1
             else:
-                print(f"✗ {formula_text:35} -> Wrong type: {type(formula).__name__}")
+                rows.append(f"✗ {formula_text:25} [{var}/{term}] -> Got {first} then {second}, "
+                            f"expected {expected_result}")
                 failed += 1
         except Exception as e:
-            print(f"✗ {formula_text:35} -> Error: {e}")
+            rows.append(f"✗ {formula_text:25} -> Error: {e}")
             failed += 1
+    sys.stdout.write("\n".join(rows) + "\n")
 
     print(f"\nResults: {passed} passed, {failed} failed")
     return passed, failed
 
 
-def test_free_variables():
-    """Test free variable detection."""
-    print("\nTesting Free Variables")
-    print("=" * 50)
+def test_interning():
+    """Test that structurally equal formulas are the same object."""
+    print("\nTesting Interning")
+    print(_RULE)
 
     tests = [
-        ("P(x)", {"x"}),
-        ("P(x) & Q(y)", {"x", "y"}),
-        ("forall x. P(x)", set()),
-        ("exists x. P(x)", set()),
-        ("forall x. P(x, y)", {"y"}),
-        ("∀x. (P(x) → Q(y))", {"y"}),
-        ("(∀x. P(x)) → Q(y)", {"y"}),
-        ("∃x. ∀y. R(x, y, z)", {"z"}),
+        ("p & q", "p ∧ q"),
+        ("forall x. P(x)", "∀x.P(x)"),
+        ("P(f(x), C)", "P(f(x),C)"),
+        ("(p -> q) -> (~q -> ~p)", "(p → q) → (¬q → ¬p)"),
     ]
 
     passed = 0
     failed = 0
 
-    for formula_text, expected_vars in tests:
+    rows = []
+    for left_text, right_text in tests:
         try:
-            formula = parse(formula_text)
-            free_vars = formula.get_free_variables()
-            if free_vars == expected_vars:
-                print(f"✓ {formula_text:30} -> {free_vars}")
+            left = parse(left_text)
+            right = parse(right_text)
+            batch = parse_many([left_text, right_text])
+            if left is right and hash(left) == hash(right) and batch == [left, right]:
+                rows.append(f"✓ {left_text:30} is {right_text}")
                 passed += 1
             else:
-                print(f"✗ {formula_text:30} -> Got {free_vars}, expected {expected_vars}")
+                rows.append(f"✗ {left_text:30} -> Not shared with {right_text}")
                 failed += 1
         except Exception as e:
-            print(f"✗ {formula_text:30} -> Error: {e}")
+            rows.append(f"✗ {left_text:30} -> Error: {e}")
             failed += 1
+    sys.stdout.write("\n".join(rows) + "\n")
 
     print(f"\nResults: {passed} passed, {failed} failed")
     return passed, failed
 
 
-def test_substitution():
-    """Test substitution in formulas."""
-    print("\nTesting Substitution")
-    print("=" * 50)
+def _raises(exc_type, func, *args):
+    """Return whether func(*args) raises exc_type."""
+    try:
+        func(*args)
+    except exc_type:
+        return True
+    return False
+
+
+def test_id_containers():
+    """Test the uid-keyed IdSet and IdDict containers."""
+    print("\nTesting Id Containers")
+    print(_RULE)
+
+    p = parse("p")
+    q = parse("q")
+    x = Variable("x")
+    checks = []
+
+    id_set = IdSet([p, x])
+    checks.append(("IdSet contains added items", p in id_set and x in id_set and len(id_set) == 2))
+    checks.append(("IdSet iterates its items", list(id_set) == [p, x]))
+    id_set.add(parse("p"))
+    checks.append(("IdSet add is idempotent", len(id_set) == 2))
+    id_set.discard("p")
+    checks.append(("IdSet ignores non-nodes", "p" not in id_set and len(id_set) == 2))
+    id_set.discard(x)
+    checks.append(("IdSet discard removes", x not in id_set and len(id_set) == 1))
+    checks.append(("IdSet remove of missing raises KeyError", _raises(KeyError, id_set.remove, q)))
+    checks.append(("IdSet remove of non-node raises KeyError", _raises(KeyError, id_set.remove, "p")))
+    checks.append(("IdSet add of non-node raises TypeError", _raises(TypeError, id_set.add, "p")))
+
+    id_dict = IdDict({p: 1})
+    id_dict[x] = 2
+    checks.append(("IdDict stores by node", id_dict[p] == 1 and id_dict[x] == 2 and len(id_dict) == 2))
+    checks.append(("IdDict iterates its keys", list(id_dict) == [p, x]))
+    checks.append(("IdDict ignores non-nodes", "p" not in id_dict and id_dict.get("p") is None))
+    checks.append(("IdDict missing key raises KeyError", _raises(KeyError, id_dict.__getitem__, q)))
+    del id_dict[x]
+    checks.append(("IdDict delete removes", x not in id_dict and len(id_dict) == 1))
+    checks.append(("IdDict delete of missing raises KeyError", _raises(KeyError, id_dict.__delitem__, x)))
+    checks.append(("IdDict set of non-node raises TypeError", _raises(TypeError, id_dict.__setitem__, "p", 3)))
+
+    passed = 0
+    failed = 0
 
-    # Create some terms for substitution
-    x_var = Variable("x")
-    y_var = Variable("y")
-    c_const = Constant("c")
+    rows = []
+    for description, ok in checks:
+        if ok:
+            rows.append(f"✓ {description}")
+            passed += 1
+        else:
+            rows.append(f"✗ {description}")
+            failed += 1
+    sys.stdout.write("\n".join(rows) + "\n")
 
-    tests = [
-        # Simple substitution
-        ("P(x)", "x", c_const, "P(C)"),
-        ("P(x) & Q(x)", "x", c_const, "(P(C) ∧ Q(C))"),
+    print(f"\nResults: {passed} passed, {failed} failed")
+    return passed, failed
+
+
+def test_parse_many():
+    """Test batch parsing and parser reuse."""
+    print("\nTesting Batch Parsing")
+    print(_RULE)
+
+    texts = ["p -> q", "P(C)", "forall x. P(x)", "p -> q"]
+    checks = []
+
+    formulas = parse_many(texts)
+    checks.append(("parse_many keeps input order", formulas == [parse(text) for text in texts]))
+    checks.append(("parse_many of nothing is empty", parse_many([]) == []))
+    checks.append(("parse_many propagates parse errors", _raises(ValueError, parse_many, ["p", "p &", "q"])))
+
+    parser = FormulaParser()
+    parser.parse("P(C)")
+    collected = set(parser.constants)
+    parser.reset()
+    checks.append(("reset clears collected constants", collected == {"C"} and not parser.constants))
+    checks.append(("reset clears input state", parser.text == "" and parser.tokens == [] and parser.i == 0))
+    checks.append(("parser is reusable after reset", parser.parse("p & q") is parse("p & q")))
+
+    passed = 0
+    failed = 0
+
+    rows = []
+    for description, ok in checks:
+        if ok:
+            rows.append(f"✓ {description}")
+            passed += 1
+        else:
+            rows.append(f"✗ {description}")
+            failed += 1
+    sys.stdout.write("\n".join(rows) + "\n")
+
+    print(f"\nResults: {passed} passed, {failed} failed")
+    return passed, failed
 
-        # No substitution (variable not present)
-        ("P(y)", "x", c_const, "P(y)"),
 
-        # Bound variable (no substitution inside quantifier)
-        ("forall x. P(x)", "x", c_const, "∀x.P(x)"),
-        ("exists x. P(x)", "x", c_const, "∃x.P(x)"),
+def test_copying():
+    """Test that copied and unpickled formulas are the interned originals."""
+    print("\nTesting Copying")
+    print(_RULE)
 
-        # Free occurrence outside quantifier
-        ("(forall x. P(x)) & Q(x)", "x", c_const, "(∀x.P(x) ∧ Q(C))"),
+    tests = [
+        "p",
+        "⊥",
+        "~(p & q)",
+        "(p | q) -> r",
+        "forall x. exists y. R(f(x), y, C)",
     ]
 
     passed = 0
     failed = 0
 
-    for formula_text, var, term, expected_result in tests:
+    rows = []
+    for formula_text in tests:
         try:
             formula = parse(formula_text)
-            result = formula.substitute(var, term)
-            result_str = str(result)
-
-            # Normalize string for comparison (handle C vs c)
-            if result_str.replace("C", "c").replace("c", "C") == expected_result.replace("C", "c").replace("c", "C"):
-                print(f"✓ {formula_text:25} [{var}/{term}] -> {result}")
+            copies = (copy.copy(formula), copy.deepcopy(formula), pickle.loads(pickle.dumps(formula)))
+            if all(duplicate is formula for duplicate in copies):
+                rows.append(f"✓ {formula_text:35} -> {formula}")
                 passed += 1
             else:
-                print(f"✗ {formula_text:25} [{var}/{term}] -> Got {result}, expected {expected_result}")
+                rows.append(f"✗ {formula_text:35} -> Copy is a different object")
                 failed += 1
         except Exception as e:
-            print(f"✗ {formula_text:25} -> Error: {e}")
+            rows.append(f"✗ {formula_text:35} -> Error: {e}")
             failed += 1
+    sys.stdout.write("\n".join(rows) + "\n")
 
     print(f"\nResults: {passed} passed, {failed} failed")
     return passed, failed
@@ -211,28 +507,17 @@ def test_substitution():
 def test_error_handling():
     """Test parser error handling."""
     print("\nTesting Error Handling")
-    print("=" * 50)
-
-    invalid_formulas = [
-        "",
-        "p &",
-        "& q",
-        "p -> ",
-        "(p",
-        "p)",
-        "((p)",
-        "forall P(x)",
-        "exists . P(x)",
-        "P(x,)",
-        "P(,y)",
-    ]
+    print(_RULE)
 
-    for formula_text in invalid_formulas:
-        try:
-            formula = parse(formula_text)
-            print(f"✗ '{formula_text}' should have failed but parsed as: {formula}")
-        except Exception as e:
-            print(f"✓ '{formula_text}' correctly rejected: {e}")
+    results = [(formula_text, *_safe_parse(formula_text, {})) for formula_text in _INVALID_FORMULAS]
+
+    rows = []
+    for formula_text, formula, error in results:
+        if error is None:
+            rows.append(f"✗ '{formula_text}' should have failed but parsed as: {formula}")
+        else:
+            rows.append(f"✓ '{formula_text}' correctly rejected: {error}")
+    sys.stdout.write("\n".join(rows) + "\n")
 
     print("\nAll invalid formulas were correctly rejected.")
 
@@ -245,20 +530,45 @@ def main():
     total_passed = 0
     total_failed = 0
 
+    # Parse every formula used by the suites once, up front
+    parsed = _parse_all(test[0] for tests in (_PROPOSITIONAL_TESTS, _FIRST_ORDER_TESTS,
+                                              _FREE_VARIABLE_TESTS, _SUBSTITUTION_TESTS)
+                        for test in tests)
+
     # Run each test suite
-    p, f = test_propositional_logic()
+    p, f = test_propositional_logic(parsed)
+    total_passed += p
+    total_failed += f
+
+    p, f = test_first_order_logic(parsed)
+    total_passed += p
+    total_failed += f
+
+    p, f = test_free_variables(parsed)
+    total_passed += p
+    total_failed += f
+
+    p, f = test_substitution(parsed)
+    total_passed += p
+    total_failed += f
+
+    p, f = test_fresh_variables()
+    total_passed += p
+    total_failed += f
+
+    p, f = test_interning()
     total_passed += p
     total_failed += f
 
-    p, f = test_first_order_logic()
+    p, f = test_parse_many()
     total_passed += p
     total_failed += f
 
-    p, f = test_free_variables()
+    p, f = test_id_containers()
     total_passed += p
     total_failed += f
 
-    p, f = test_substitution()
+    p, f = test_copying()
     total_passed += p
     total_failed += f
 